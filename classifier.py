@@ -6,11 +6,11 @@ Removed General (Thank You) and aligned with exact hierarchy
 
 import logging
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from email_classifier.preprocessor import EmailPreprocessor
 from email_classifier.nlp_utils import NLPProcessor, TextAnalysis
-from email_classifier.ml_classifier import MLClassifier
+from email_classifier.ml_classifier import MLClassifier, MODEL_NAME
 from email_classifier.rule_engine import RuleEngine, RuleResult
 
 logger = logging.getLogger(__name__)
@@ -34,12 +34,12 @@ class EmailClassifier:
         "uncategorized"            # Fallback cases
     ]
     
-    def __init__(self):
+    def __init__(self, ml_model_name: str = MODEL_NAME):
         self.logger = logging.getLogger(__name__)
         self.preprocessor = EmailPreprocessor()
         self.nlp_processor = NLPProcessor()
-        self.ml_classifier = MLClassifier()
-        self.rule_engine = RuleEngine()
+        self.ml_classifier = MLClassifier(model_name=ml_model_name)
+        self.rule_engine = RuleEngine(nlp_processor=self.nlp_processor)
         self.logger.info("✅ Clean EmailClassifier initialized")
 
     def classify_email(self, subject: str, body: str, email_id: Optional[int] = None) -> Dict[str, Any]:
@@ -56,12 +56,7 @@ class EmailClassifier:
                 return self._create_fallback_result("Empty content after preprocessing", start_time)
             
             # Step 2: NLP Analysis
-            analysis = None
-            try:
-                analysis = self.nlp_processor.analyze_text(processed.cleaned_text)
-                self.logger.debug(f"NLP extracted {len(analysis.entities)} entities, {len(analysis.topics)} topics")
-            except Exception as e:
-                self.logger.warning(f"NLP analysis failed: {e}")
+            analysis = self._analyze_text(processed.cleaned_text)
             
             # Step 3: ML Classification (lightweight first pass)
             ml_result = None
@@ -70,52 +65,116 @@ class EmailClassifier:
                 self.logger.debug(f"ML classified as: {ml_result['category']}/{ml_result['subcategory']}")
             except Exception as e:
                 self.logger.warning(f"ML classification failed: {e}")
-                ml_result = {
-                    'category': 'Manual Review',
-                    'subcategory': 'Complex Queries',
-                    'confidence': 0.5,
-                    'reason': f'ML error: {str(e)}'
-                }
+                ml_result = self._create_ml_error_result(e)
+            
+            # Steps 4-6: Rules, final result and label
+            return self._finalize_classification(processed, analysis, ml_result, start_time, email_id)
             
-            # Step 4: Rule Engine Classification (final decision)
+        except Exception as e:
+            self.logger.error(f"Classification pipeline error: {e}")
+            return self._create_fallback_result(f"Pipeline error: {str(e)}", start_time)
+
+    def classify_emails(self, emails: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Batch classification - same flow as classify_email with one batched ML pass.
+        Flow: Preprocess + NLP (per email) → ML (batched) → Rules → Final Label
+        Results are in input order; processing_time is measured from the start of the batch.
+        """
+        start_time = time.time()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(emails)
+        prepared = []  # (index, processed, analysis) for emails with content
+        
+        # Steps 1-2: Preprocessing and NLP per email
+        for email_id, (subject, body) in enumerate(emails):
             try:
-                rule_result = self.rule_engine.classify_sublabel(
-                    main_category=ml_result['category'],
-                    text=processed.cleaned_text,
-                    analysis=analysis,
-                    ml_result=ml_result,
-                    subject=processed.cleaned_subject
-                )
-                self.logger.debug(f"Rules classified as: {rule_result.category}/{rule_result.subcategory}")
+                processed = self.preprocessor.preprocess_email(subject or "", body)
+                if not processed.cleaned_text:
+                    results[email_id] = self._create_fallback_result("Empty content after preprocessing", start_time)
+                    continue
+                prepared.append((email_id, processed, self._analyze_text(processed.cleaned_text)))
             except Exception as e:
-                self.logger.error(f"Rule engine failed: {e}")
-                rule_result = RuleResult(
-                    category='Manual Review',
-                    subcategory='Complex Queries',
-                    confidence=0.4,
-                    reason=f'Rule engine error: {str(e)}',
-                    matched_rules=['error_fallback']
+                self.logger.error(f"Classification pipeline error: {e}")
+                results[email_id] = self._create_fallback_result(f"Pipeline error: {str(e)}", start_time)
+        
+        # Step 3: ML Classification for the whole batch at once
+        try:
+            ml_results = self.ml_classifier.classify_emails(
+                [processed.cleaned_text for _, processed, _ in prepared]
+            )
+        except Exception as e:
+            self.logger.warning(f"ML classification failed: {e}")
+            ml_results = [self._create_ml_error_result(e) for _ in prepared]
+        
+        # Steps 4-6: Rules, final result and label per email
+        for (email_id, processed, analysis), ml_result in zip(prepared, ml_results):
+            try:
+                results[email_id] = self._finalize_classification(
+                    processed, analysis, ml_result, start_time, email_id
                 )
-            
-            # Step 5: Create final result
-            final_result = self._create_final_result(
-                rule_result=rule_result,
-                ml_result=ml_result,
+            except Exception as e:
+                self.logger.error(f"Classification pipeline error: {e}")
+                results[email_id] = self._create_fallback_result(f"Pipeline error: {str(e)}", start_time)
+        
+        return results
+
+    def _analyze_text(self, cleaned_text: str) -> Optional[TextAnalysis]:
+        """NLP analysis step; None if it fails."""
+        try:
+            analysis = self.nlp_processor.analyze_text(cleaned_text)
+            self.logger.debug(f"NLP extracted {len(analysis.entities)} entities, {len(analysis.topics)} topics")
+            return analysis
+        except Exception as e:
+            self.logger.warning(f"NLP analysis failed: {e}")
+            return None
+
+    def _create_ml_error_result(self, error: Exception) -> Dict[str, Any]:
+        """ML result used when the ML step fails."""
+        return {
+            'category': 'Manual Review',
+            'subcategory': 'Complex Queries',
+            'confidence': 0.5,
+            'reason': f'ML error: {str(error)}'
+        }
+
+    def _finalize_classification(self, processed, analysis: Optional[TextAnalysis], ml_result: Dict[str, Any],
+                                 start_time: float, email_id: Optional[int] = None) -> Dict[str, Any]:
+        """Rule engine decision, final result and final label for one preprocessed email."""
+        
+        # Step 4: Rule Engine Classification (final decision)
+        try:
+            rule_result = self.rule_engine.classify_sublabel(
+                main_category=ml_result['category'],
+                text=processed.cleaned_text,
                 analysis=analysis,
-                processed=processed,
-                start_time=start_time
+                ml_result=ml_result,
+                subject=processed.cleaned_subject
             )
-            
-            # Step 6: Map to standardized final label
-            final_label = self._map_to_final_label(rule_result, analysis)
-            final_result['final_label'] = final_label
-            
-            self.logger.info(f"Email {email_id}: {rule_result.category}/{rule_result.subcategory} → {final_label}")
-            return final_result
-            
+            self.logger.debug(f"Rules classified as: {rule_result.category}/{rule_result.subcategory}")
         except Exception as e:
-            self.logger.error(f"Classification pipeline error: {e}")
-            return self._create_fallback_result(f"Pipeline error: {str(e)}", start_time)
+            self.logger.error(f"Rule engine failed: {e}")
+            rule_result = RuleResult(
+                category='Manual Review',
+                subcategory='Complex Queries',
+                confidence=0.4,
+                reason=f'Rule engine error: {str(e)}',
+                matched_rules=['error_fallback']
+            )
+        
+        # Step 5: Create final result
+        final_result = self._create_final_result(
+            rule_result=rule_result,
+            ml_result=ml_result,
+            analysis=analysis,
+            processed=processed,
+            start_time=start_time
+        )
+        
+        # Step 6: Map to standardized final label
+        final_label = self._map_to_final_label(rule_result, analysis)
+        final_result['final_label'] = final_label
+        
+        self.logger.info(f"Email {email_id}: {rule_result.category}/{rule_result.subcategory} → {final_label}")
+        return final_result
 
     def _create_final_result(self, rule_result: RuleResult, ml_result: Dict[str, Any], 
                            analysis: Optional[TextAnalysis], processed, start_time: float) -> Dict[str, Any]:
@@ -4,11 +4,18 @@ Works with Rule Engine and Pattern Matcher
 Removed General (Thank You) and simplified for performance
 """
 
+import copy
 import logging
-import torch
-from transformers import pipeline
-from typing import Dict, Any, List, Optional
+import os
 import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+import torch
+from torch.utils.data import DataLoader, Dataset
+from transformers import AutoConfig, AutoModelForSequenceClassification, AutoTokenizer
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +27,114 @@ CONFIDENCE_THRESHOLDS = {
 }
 
 MAX_TEXT_LENGTH = 256  # Reduced for performance
+MAX_PREMISE_TOKENS = 64  # Token budget for the model premise; attention cost grows with length squared
 MIN_TEXT_LENGTH = 10
+BATCH_SIZE = 32  # Emails per zero-shot forward pass in classify_emails
+USE_TORCH_COMPILE = True  # Compile the model with CUDA graphs on GPU; set False to debug in eager mode
+COMPILE_WARMUP_STEPS = 3  # Warmup forwards per compiled shape, until its CUDA graph replays
+# Compiled model: batches are padded to the full pair length and up to one of these premise counts
+# (powers of two up to BATCH_SIZE), so it only ever sees these shapes - within dynamo's recompile limit
+COMPILE_BATCH_BUCKETS = (1, 2, 4, 8, 16, 32)
+RESULT_CACHE_SIZE = 10000  # Model results kept for repeated (template) emails, keyed by cleaned text
+KEYWORD_MARGIN = 2.0  # Winning keyword category needs this multiple of the runner-up's hits to count as clear
+
+# Invariant result for empty/too-short emails, copied per call instead of rebuilt
+EMPTY_CONTENT_RESULT = {
+    'category': 'Manual Review',
+    'subcategory': 'Complex Queries',
+    'confidence': 0.3,
+    'method_used': 'ml_classification',
+    'reason': 'Empty content'
+}
+
+# Default zero-shot NLI model (any NLI checkpoint with an entailment label works, e.g. "valhalla/distilbart-mnli-12-3")
+MODEL_NAME = "facebook/bart-large-mnli"
+# Opt-in distilled model: encoder-only, ~70M params (22M backbone + 48M embeddings) against BART's 407M,
+# binary entailment/not_entailment head; not the default until ZERO_SHOT_THRESHOLD is calibrated for it
+DISTILLED_MODEL_NAME = "MoritzLaurer/deberta-v3-xsmall-zeroshot-v1.1-all-33"
+# Tried in order when the requested model cannot be loaded, smallest first
+FALLBACK_MODEL_NAMES = ["cross-encoder/nli-deberta-v3-xsmall", "valhalla/distilbart-mnli-12-3"]
+HYPOTHESIS_TEMPLATE = "This example is {}."
+# Minimum softmax share of the winning category; tuned on bart-large-mnli, re-check before changing MODEL_NAME
+ZERO_SHOT_THRESHOLD = 0.6
+MODEL_RETRY_SECONDS = 300  # Wait before retrying a model that failed to load (hub outage, missing files)
+
+# Opt-in: dynamic INT8 on CPU-only hosts; activation scales are computed per batch, so a
+# score can shift with whatever else shares the batch - off by default for reproducible results
+USE_DYNAMIC_QUANTIZATION = False
+# Opt-in: IPEX oneDNN kernels in BF16 on CPUs with native BF16 (needs intel_extension_for_pytorch);
+# off by default so scores do not change with whichever packages are installed
+USE_IPEX = False
+
+# Opt-in: run the model through ONNX Runtime (needs optimum[onnxruntime]); off by default so the
+# backend, and with it the exact scores, does not change with whichever packages are installed
+USE_ONNX_RUNTIME = False
+# Optimized ONNX exports are cached here so the export only runs once per model revision
+ONNX_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "email_classifier", "onnx")
+ONNX_MODEL_FILE = "model_optimized.onnx"
+ONNX_QUANTIZED_MODEL_FILE = "model_optimized_quantized.onnx"  # Name ORTQuantizer gives the INT8 copy
+
+# Characters replaced by spaces in preprocessing
+NON_WORD_PATTERN = re.compile(r'[^\w\s@.-]')
+# ASCII lookup table for the same characters; str.translate avoids the regex engine
+NON_WORD_TABLE = {c: ' ' for c in range(128) if NON_WORD_PATTERN.match(chr(c))}
+
+# Device is probed once per process, not per instance; is_available() does not create a CUDA
+# context, so importing this module stays cheap and fork-safe (the weight dtype is picked at load)
+DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+# Loaded models shared by all MLClassifier instances, keyed by model name
+_MODEL_CACHE: Dict[str, tuple] = {}
+_MODEL_LOCK = threading.Lock()
+# Failed loads are not cached; the time of the last failure per model name holds off retries
+_MODEL_FAILURES: Dict[str, float] = {}
+
+class _PremiseDataset(Dataset):
+    """Email premises tokenized per item and paired with the cached hypothesis tails on collate."""
+
+    def __init__(self, texts: List[str], tokenizer, pair_prefix: List[int], hypothesis_tails: List[List[int]],
+                 segment_template: Optional[tuple] = None, max_length: Optional[int] = None,
+                 batch_buckets: Optional[tuple] = None):
+        self.texts = texts
+        self.tokenizer = tokenizer
+        self.pair_prefix = pair_prefix
+        self.hypothesis_tails = hypothesis_tails
+        self.segment_template = segment_template  # (prefix ids, premise id, tail ids) for BERT-style pairs
+        self.max_length = max_length  # Fixed pair length, or None to pad to the longest pair
+        self.batch_buckets = batch_buckets  # Premise counts batches are padded up to, or None
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __getitem__(self, idx: int) -> List[int]:
+        return self.tokenizer(
+            self.texts[idx], add_special_tokens=False, truncation=True, max_length=MAX_PREMISE_TOKENS
+        )['input_ids']
+
+    def collate(self, premises: List[List[int]]) -> tuple[Dict[str, torch.Tensor], int]:
+        """Pair every premise with every hypothesis and pad into one batch; also returns the real premise count."""
+        count = len(premises)
+        if self.batch_buckets:
+            # Empty premises fill the batch up to its bucket; their scores are dropped
+            bucket = next((size for size in self.batch_buckets if size >= count), count)
+            premises = premises + [[]] * (bucket - count)
+        
+        features = {'input_ids': [
+            self.pair_prefix + premise + tail
+            for premise in premises
+            for tail in self.hypothesis_tails
+        ]}
+        if self.segment_template:
+            prefix_types, premise_type, tail_types = self.segment_template
+            features['token_type_ids'] = [
+                prefix_types + [premise_type] * len(premise) + types
+                for premise in premises
+                for types in tail_types
+            ]
+        padding = 'max_length' if self.max_length else 'longest'
+        return dict(self.tokenizer.pad(
+            features, padding=padding, max_length=self.max_length, return_tensors="pt"
+        )), count
 
 class MLClassifier:
     """
@@ -28,24 +142,242 @@ class MLClassifier:
     Simple, fast, and works with rule engine.
     """
     
-    def __init__(self):
+    def __init__(self, model_name: str = MODEL_NAME):
         self.logger = logging.getLogger(__name__)
-        self._initialize_model()
+        self.model_name = model_name
         self._initialize_categories()
+        self._initialize_keywords()
+        self._initialize_model()
+        self._initialize_cache()
+        self._initialize_stats()
         self.logger.info("✅ Lightweight ML Classifier initialized")
 
     def _initialize_model(self) -> None:
-        """Initialize lightweight model."""
+        """Set up lazy model state; the model loads on first use and is shared across instances."""
+        self.device = DEVICE
+        self.tokenizer = None
+        self.model = None
+        self.loaded_model_name = None  # Differs from model_name when a fallback was loaded
+        self._model_loaded = False
+        self.model_dtype = None  # Weight dtype, known once the model is loaded
+
+    def _initialize_cache(self) -> None:
+        """Set up the LRU cache of model results for repeated emails."""
+        self._result_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    def _initialize_stats(self) -> None:
+        """Counters for how often the zero-shot model is skipped."""
+        self._model_skipped = 0
+        self._model_scored = 0
+
+    def _ensure_model(self) -> bool:
+        """Attach the shared zero-shot model, loading it on first use by any instance."""
+        if not self._model_loaded:
+            with _MODEL_LOCK:
+                if self.model_name not in _MODEL_CACHE and self._model_retry_due():
+                    loaded = self._load_model()
+                    if loaded[1] is None:
+                        _MODEL_FAILURES[self.model_name] = time.monotonic()
+                    else:
+                        _MODEL_CACHE[self.model_name] = loaded
+                        _MODEL_FAILURES.pop(self.model_name, None)
+                cached = _MODEL_CACHE.get(self.model_name)
+            
+            if cached is not None:
+                tokenizer, model, self.loaded_model_name, self.model_dtype = cached
+                if model is not self.model:
+                    self.tokenizer, self.model = tokenizer, model
+                    self._initialize_hypotheses()
+                self._model_loaded = True
+        
+        return self._model_loaded
+
+    def _model_retry_due(self) -> bool:
+        """Whether this model never failed to load, or failed long enough ago to try again."""
+        failed_at = _MODEL_FAILURES.get(self.model_name)
+        return failed_at is None or time.monotonic() - failed_at >= MODEL_RETRY_SECONDS
+
+    def _load_model(self) -> tuple:
+        """Load, optimize and warm up the zero-shot model; (tokenizer, model, name, dtype), or Nones if unavailable."""
+        if DEVICE.type == "cuda":
+            # Half-precision weights halve memory traffic; BF16 (FP32 range) only where Ampere+ runs it natively
+            self.model_dtype = torch.bfloat16 if torch.cuda.get_device_capability()[0] >= 8 else torch.float16
+        else:
+            self.model_dtype = torch.float32
+        
+        # Requested model first, then the smaller fallbacks
+        candidates = [self.model_name] + [name for name in FALLBACK_MODEL_NAMES if name != self.model_name]
+        for model_name in candidates:
+            try:
+                self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+                self.model = self._load_onnx_model(model_name)
+                if self.model is None:
+                    # BART/RoBERTa attention runs through fused SDPA by default; DeBERTa-v2/v3 has no
+                    # SDPA path, so its attention is only fused on the opt-in ONNX Runtime backend
+                    self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
+                    self.model.to(self.device, dtype=self.model_dtype).eval()
+                self._initialize_hypotheses()
+                self.logger.info(f"✅ Zero-shot model loaded: {model_name}")
+                if model_name != self.model_name:
+                    self.logger.warning(f"Zero-shot model {self.model_name} unavailable, using fallback {model_name}")
+                break
+            except Exception as e:
+                self.logger.warning(f"Zero-shot model {model_name} failed: {e}")
+                self.tokenizer, self.model = None, None
+        else:
+            return None, None, None, None
+        
+        # ONNX Runtime graphs are already fused and optimized
+        if not isinstance(self.model, torch.nn.Module):
+            return self.tokenizer, self.model, model_name, self.model_dtype
+
+        if DEVICE.type == "cuda":
+            if USE_TORCH_COMPILE:
+                self._compile_model()
+        elif not (USE_IPEX and self._optimize_with_ipex()) and USE_DYNAMIC_QUANTIZATION:
+            self._quantize_for_cpu()
+        return self.tokenizer, self.model, model_name, self.model_dtype
+
+    def _initialize_hypotheses(self) -> None:
+        """Pre-tokenize the fixed candidate hypotheses once, as pair templates around the premise."""
+        self.category_labels = list(self.main_categories.keys())
+
+        # Encode a probe premise with each hypothesis: the tokens before the probe are the
+        # shared pair prefix, the tokens after it are the cached tail for that hypothesis
+        probe = "premise"
+        probe_ids = self.tokenizer(probe, add_special_tokens=False)['input_ids']
+        self.hypothesis_tails = []
+        tail_types = []
+        self.segment_template = None
+        for description in self.main_categories.values():
+            encoding = self.tokenizer(probe, HYPOTHESIS_TEMPLATE.format(description))
+            pair_ids = encoding['input_ids']
+            start = next(
+                i for i in range(len(pair_ids)) if pair_ids[i:i + len(probe_ids)] == probe_ids
+            )
+            self.pair_prefix = pair_ids[:start]
+            self.hypothesis_tails.append(pair_ids[start + len(probe_ids):])
+            
+            # Segment ids (BERT-style pair checkpoints) split the same way; the premise is one segment
+            type_ids = encoding.get('token_type_ids')
+            if type_ids:
+                tail_types.append(type_ids[start + len(probe_ids):])
+                self.segment_template = (type_ids[:start], type_ids[start], tail_types)
+        # Longest possible pair: the fixed length compiled batches are padded to
+        self.max_pair_length = len(self.pair_prefix) + MAX_PREMISE_TOKENS + max(map(len, self.hypothesis_tails))
+
+        # Same lookup the zero-shot pipeline uses; matches binary (entailment/not_entailment)
+        # heads as well as 3-way MNLI ones (entailment/neutral/contradiction)
+        self.entailment_id = next(
+            (idx for label, idx in self.model.config.label2id.items() if label.lower().startswith("entail")),
+            -1
+        )
+
+    def _load_onnx_model(self, model_name: str):
+        """Load an ONNX Runtime export with fused transformer ops when enabled and optimum is installed."""
+        if not USE_ONNX_RUNTIME:
+            return None
+
+        try:
+            from optimum.onnxruntime import ORTModelForSequenceClassification, ORTOptimizer, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig, OptimizationConfig
+        except ImportError:
+            return None
+
+        use_cuda = DEVICE.type == "cuda"
+        provider = "CUDAExecutionProvider" if use_cuda else "CPUExecutionProvider"
         try:
-            self.classifier = pipeline(
-                "zero-shot-classification",
-                model="facebook/bart-large-mnli",
-                device=0 if torch.cuda.is_available() else -1
+            # Keyed on the hub revision so an updated checkpoint is re-exported
+            revision = getattr(AutoConfig.from_pretrained(model_name), '_commit_hash', None) or "main"
+            save_dir = os.path.join(ONNX_CACHE_DIR, model_name.replace("/", "--"), revision)
+            if not os.path.exists(os.path.join(save_dir, ONNX_MODEL_FILE)):
+                # Level 99 fuses attention, SkipLayerNorm and Gelu into single kernels
+                exported = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+                ORTOptimizer.from_pretrained(exported).optimize(
+                    save_dir=save_dir,
+                    optimization_config=OptimizationConfig(
+                        optimization_level=99, optimize_for_gpu=use_cuda, fp16=use_cuda
+                    ),
+                )
+            
+            # CPU: dynamic INT8 on top of the fused graph when enabled, as the PyTorch path does
+            model_file = ONNX_MODEL_FILE
+            if not use_cuda and USE_DYNAMIC_QUANTIZATION:
+                model_file = ONNX_QUANTIZED_MODEL_FILE
+                if not os.path.exists(os.path.join(save_dir, model_file)):
+                    ORTQuantizer.from_pretrained(save_dir, file_name=ONNX_MODEL_FILE).quantize(
+                        save_dir=save_dir,
+                        quantization_config=AutoQuantizationConfig.avx2(is_static=False, per_channel=False),
+                    )
+            
+            model = ORTModelForSequenceClassification.from_pretrained(
+                save_dir, file_name=model_file, provider=provider, use_io_binding=use_cuda
             )
-            self.logger.info("✅ BART model loaded")
+            self.logger.info(f"✅ ONNX Runtime model ready ({provider})")
+            return model
         except Exception as e:
-            self.logger.warning(f"BART model failed: {e}")
-            self.classifier = None
+            self.logger.warning(f"ONNX Runtime export failed, using PyTorch: {e}")
+            return None
+
+    def _compile_model(self) -> None:
+        """Compile the model with CUDA graph capture and pay the warmup cost for every batch shape at init."""
+        if not hasattr(torch, 'compile'):
+            return
+
+        eager_model = self.model
+        try:
+            self.model = torch.compile(self.model, mode="reduce-overhead", dynamic=False)
+            # CUDA graphs warm up on the first run, record on the second and replay after; run each
+            # static shape (one per batch bucket) through that here so serving only replays graphs
+            dataset = self._premise_dataset(["warmup"])
+            for bucket in COMPILE_BATCH_BUCKETS:
+                batch = dataset.collate([dataset[0]] * bucket)
+                for _ in range(COMPILE_WARMUP_STEPS):
+                    self._score_batch(*batch)
+            self.logger.info("✅ Zero-shot model compiled")
+        except Exception as e:
+            self.logger.warning(f"Zero-shot model compile failed, using eager mode: {e}")
+            self.model = eager_model
+
+    def _optimize_with_ipex(self) -> bool:
+        """Use IPEX oneDNN kernels in BF16 on CPUs with native BF16 (AMX/AVX512-BF16), where installed."""
+        try:
+            import intel_extension_for_pytorch as ipex
+        except ImportError:
+            return False
+
+        if not torch.ops.mkldnn._is_mkldnn_bf16_supported():
+            return False
+
+        fp32_model = self.model
+        try:
+            # Module.to() converts in place; a copy keeps the FP32 weights exact if IPEX fails
+            bf16_model = copy.deepcopy(fp32_model).to(dtype=torch.bfloat16)
+            self.model = ipex.optimize(bf16_model, dtype=torch.bfloat16)
+            self._zero_shot("warmup")
+            self.model_dtype = torch.bfloat16
+            self.logger.info("✅ Zero-shot model optimized with IPEX (BF16)")
+            return True
+        except Exception as e:
+            self.logger.warning(f"IPEX optimization failed, keeping FP32: {e}")
+            self.model = fp32_model
+            return False
+
+    def _quantize_for_cpu(self) -> None:
+        """Quantize Linear layers to INT8 for CPU inference (weights quantized once, activations per call)."""
+        fp32_model = self.model
+        try:
+            self.model = torch.ao.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            self._zero_shot("warmup")
+            self.logger.info("✅ Zero-shot model quantized to INT8 for CPU")
+        except Exception as e:
+            self.logger.warning(f"INT8 quantization failed, using FP32: {e}")
+            self.model = fp32_model
 
     def _initialize_categories(self) -> None:
         """Initialize simplified categories for ML classification."""
@@ -66,9 +398,21 @@ class MLClassifier:
             "Auto Reply": "No Info/Autoreply"
         }
 
+    def _initialize_keywords(self) -> None:
+        """Initialize keyword indicators and business terms."""
+        # Ordered by priority - dispute indicators must win over everything else
+        self.keyword_indicators = {
+            "Manual Review": ['dispute', 'owe nothing', 'scam', 'fdcpa', 'cease and desist'],
+            "Payments Claim": ['proof of payment', 'payment confirmation', 'check number', 'transaction id'],
+            "Invoices Request": ['send me the invoice', 'need invoice copy', 'provide invoice'],
+            "Auto Reply": ['out of office', 'automatic reply', 'survey', 'feedback'],
+            "No Reply": ['ticket created', 'case opened', 'processing error', 'system notification']
+        }
+        self.business_terms = ['payment', 'invoice', 'dispute', 'collection', 'debt']
+
     def classify_email(self, text: str) -> Dict[str, Any]:
         """
-        Simple ML classification for hybrid approach.
+        Simple ML classification for hybrid approach (a batch of one).
         
         Args:
             text: Email content to classify
@@ -76,103 +420,232 @@ class MLClassifier:
         Returns:
             Basic classification result
         """
-        if not text or len(text.strip()) < MIN_TEXT_LENGTH:
-            return self._create_result("Manual Review", "Complex Queries", 0.3, "Empty content")
+        return self.classify_emails([text])[0]
 
-        cleaned_text = self._preprocess_text(text)
+    def classify_emails(self, texts: List[str], batch_size: int = BATCH_SIZE,
+                        num_workers: int = 0) -> List[Dict[str, Any]]:
+        """
+        Classify many emails, batching the zero-shot model calls.
         
-        # ML Classification
-        main_category, confidence = self._classify_main_category(cleaned_text)
-        subcategory = self._get_default_subcategory(main_category)
+        Args:
+            texts: Email contents to classify
+            batch_size: Emails per model forward pass
+            num_workers: DataLoader worker processes for premise tokenization
+            
+        Returns:
+            Classification results in input order
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        pending = []  # (index, cleaned text) not settled by keywords
         
-        return self._create_result(
-            category=main_category,
-            subcategory=subcategory,
-            confidence=confidence,
-            reason=f"ML: {main_category}"
-        )
-
-    def _classify_main_category(self, text: str) -> tuple[str, float]:
-        """Simple main category classification."""
+        for idx, text in enumerate(texts):
+            if not text or len(text.strip()) < MIN_TEXT_LENGTH:
+                results[idx] = dict(EMPTY_CONTENT_RESULT)
+                continue
+            
+            cleaned_text = self._preprocess_text(text)
+            # Clear keyword winners skip the model; close calls go to the model to disambiguate
+            keyword_match = self._quick_keyword_check(cleaned_text)
+            if keyword_match and not keyword_match[1]:
+                results[idx] = self._create_category_result(keyword_match[0], CONFIDENCE_THRESHOLDS['medium'])
+                continue
+            
+            # Previously scored emails skip the model too
+            cached_result = self._cached_result(cleaned_text)
+            if cached_result:
+                results[idx] = self._create_category_result(*cached_result)
+            else:
+                pending.append((idx, cleaned_text))
         
-        # Quick keyword check first
-        keyword_category = self._quick_keyword_check(text)
-        if keyword_category:
-            return keyword_category, CONFIDENCE_THRESHOLDS['medium']
+        self._model_skipped += len(texts) - len(pending)
+        if not pending:
+            return results
         
-        # Use BART if available
-        if self.classifier:
+        # Repeated emails within the batch are scored once
+        pending_texts = list(dict.fromkeys(cleaned_text for _, cleaned_text in pending))
+        all_scores: List[Optional[List[float]]] = [None] * len(pending_texts)
+        if self._ensure_model():
             try:
-                result = self.classifier(
-                    text[:MAX_TEXT_LENGTH], 
-                    list(self.main_categories.values()),
-                    multi_label=False
-                )
-                
-                if result['scores'][0] > 0.6:
-                    best_description = result['labels'][0]
-                    for category, description in self.main_categories.items():
-                        if description == best_description:
-                            return category, min(result['scores'][0], 0.85)
+                all_scores = self._zero_shot_batch(pending_texts, batch_size, num_workers)
+                self._model_scored += len(pending)
             except Exception as e:
-                self.logger.debug(f"BART failed: {e}")
+                self.logger.debug(f"Zero-shot model failed: {e}")
+        
+        resolved = {}
+        for cleaned_text, scores in zip(pending_texts, all_scores):
+            resolved[cleaned_text] = self._resolve_scores(scores, cleaned_text)
+            if scores is not None:
+                self._cache_result(cleaned_text, resolved[cleaned_text])
+        
+        for idx, cleaned_text in pending:
+            results[idx] = self._create_category_result(*resolved[cleaned_text])
+        
+        return results
+
+    def _cached_result(self, text: str) -> Optional[tuple[str, float]]:
+        """Look up a previous model result for this cleaned text."""
+        with self._cache_lock:
+            result = self._result_cache.get(text)
+            if result is None:
+                self._cache_misses += 1
+                return None
+            self._result_cache.move_to_end(text)
+            self._cache_hits += 1
+            return result
+
+    def _cache_result(self, text: str, result: tuple[str, float]) -> None:
+        """Remember a model result, evicting the least recently used entry when full."""
+        with self._cache_lock:
+            self._result_cache[text] = result
+            self._result_cache.move_to_end(text)
+            if len(self._result_cache) > RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+
+    def cache_info(self) -> Dict[str, int]:
+        """Result cache statistics for monitoring."""
+        with self._cache_lock:
+            return {
+                'hits': self._cache_hits,
+                'misses': self._cache_misses,
+                'size': len(self._result_cache),
+                'max_size': RESULT_CACHE_SIZE
+            }
+
+    def _resolve_scores(self, scores: Optional[List[float]], text: str) -> tuple[str, float]:
+        """Pick the zero-shot winner if confident enough, else the keyword result or fallback."""
+        keyword_match = self._quick_keyword_check(text)
+        if scores:
+            candidates = range(len(scores))
+            if keyword_match:
+                # Close keyword call: the model only chooses between the categories that matched
+                candidates = [
+                    self.category_labels.index(category) for category in keyword_match[1] or keyword_match[:1]
+                ]
+            best = max(candidates, key=scores.__getitem__)
+            if scores[best] > ZERO_SHOT_THRESHOLD:
+                return self.category_labels[best], min(scores[best], 0.85)
+        
+        # Close keyword call the model could not settle - keep the priority-order winner
+        if keyword_match:
+            return keyword_match[0], CONFIDENCE_THRESHOLDS['medium']
         
         # Fallback
         return self._fallback_classification(text)
 
-    def _quick_keyword_check(self, text: str) -> Optional[str]:
-        """Quick keyword-based classification."""
-        text_lower = text.lower()
-        
-        # Strong dispute indicators
-        if any(word in text_lower for word in [
-            'dispute', 'owe nothing', 'scam', 'fdcpa', 'cease and desist'
-        ]):
-            return "Manual Review"
-        
-        # Payment proof indicators
-        if any(phrase in text_lower for phrase in [
-            'proof of payment', 'payment confirmation', 'check number', 'transaction id'
-        ]):
-            return "Payments Claim"
-        
-        # Invoice request indicators
-        if any(phrase in text_lower for phrase in [
-            'send me the invoice', 'need invoice copy', 'provide invoice'
-        ]):
-            return "Invoices Request"
-        
-        # Auto-reply indicators
-        if any(phrase in text_lower for phrase in [
-            'out of office', 'automatic reply', 'survey', 'feedback'
-        ]):
-            return "Auto Reply"
-        
-        # System/processing indicators
-        if any(phrase in text_lower for phrase in [
-            'ticket created', 'case opened', 'processing error', 'system notification'
-        ]):
-            return "No Reply"
-        
-        return None
-
-    def _fallback_classification(self, text: str) -> tuple[str, float]:
-        """Simple fallback based on basic business terms."""
-        text_lower = text.lower()
-        
-        # Business terms count
-        business_terms = ['payment', 'invoice', 'dispute', 'collection', 'debt']
-        business_count = sum(1 for term in business_terms if term in text_lower)
+    def _premise_dataset(self, texts: List[str]) -> _PremiseDataset:
+        """Dataset pairing the given premises with the cached hypotheses."""
+        # Compiled models keep `_orig_mod`; their CUDA graphs need static shapes, eager models pad exactly
+        if hasattr(self.model, '_orig_mod'):
+            return _PremiseDataset(
+                texts, self.tokenizer, self.pair_prefix, self.hypothesis_tails, self.segment_template,
+                self.max_pair_length, COMPILE_BATCH_BUCKETS
+            )
+        return _PremiseDataset(
+            texts, self.tokenizer, self.pair_prefix, self.hypothesis_tails, self.segment_template
+        )
+
+    def _zero_shot(self, text: str) -> List[float]:
+        """Zero-shot NLI scores for each main category, in main_categories order."""
+        dataset = self._premise_dataset([text])
+        return self._score_batch(*dataset.collate([dataset[0]]))[0].tolist()
+
+    def _zero_shot_batch(self, texts: List[str], batch_size: int, num_workers: int) -> List[List[float]]:
+        """Zero-shot NLI scores for many texts; DataLoader workers tokenize ahead of the model."""
+        # Similar lengths share a batch so each batch pads to little more than its own longest premise
+        order = sorted(range(len(texts)), key=lambda idx: len(texts[idx]))
+        dataset = self._premise_dataset([texts[idx] for idx in order])
+        if dataset.batch_buckets:
+            batch_size = min(batch_size, dataset.batch_buckets[-1])
+        loader = DataLoader(
+            dataset,
+            batch_size=batch_size,
+            num_workers=num_workers,
+            collate_fn=dataset.collate,
+            pin_memory=self.device.type == "cuda"
+        )
+        
+        # Scores stay on the device until the end: no per-batch sync, so the next
+        # batch is collated and copied while the GPU still runs the previous one
+        batch_scores = [self._score_batch(*batch) for batch in loader]
+        if not batch_scores:
+            return []
+        
+        # Back to input order
+        sorted_scores = torch.cat(batch_scores).tolist()
+        scores: List[List[float]] = [[] for _ in texts]
+        for position, idx in enumerate(order):
+            scores[idx] = sorted_scores[position]
+        return scores
+
+    def _score_batch(self, batch: Dict[str, torch.Tensor], count: int) -> torch.Tensor:
+        """
+        Run one padded batch of premise/hypothesis pairs through the model.
+        
+        Premises are tokenized once (capped at MAX_PREMISE_TOKENS) and joined with
+        the cached hypothesis tails; per premise, scores are the softmax of the
+        entailment logits across categories (same as the pipeline with multi_label=False).
+        Returns a (count, categories) tensor left on the model device; rows of
+        bucket padding past the first `count` premises are dropped.
+        """
+        batch = {key: value.to(self.device, non_blocking=True) for key, value in batch.items()}
+        
+        with torch.inference_mode():
+            logits = self.model(**batch).logits
+        
+        entailment = logits[:, self.entailment_id].float().view(-1, len(self.hypothesis_tails))
+        return entailment.softmax(dim=-1)[:count]
+
+    def _quick_keyword_check(self, text_lower: str) -> Optional[tuple[str, List[str]]]:
+        """
+        Quick keyword-based classification on already lowercased text.
+        
+        Returns the priority-order winner and, for a close call, the categories
+        the model should choose between (empty when the winner is clear).
+        """
+        hits: Dict[str, int] = {}
+        for category, keywords in self.keyword_indicators.items():
+            count = sum(text_lower.count(keyword) for keyword in keywords)
+            if not count:
+                continue
+            if category == "Manual Review":
+                # Dispute/legal language always wins - no need to scan the other groups
+                return category, []
+            hits[category] = count
+        
+        if not hits:
+            return None
+        
+        # Categories are in priority order, first hit wins unless another comes within the margin
+        best_category = next(iter(hits))
+        rivals = [
+            category for category, count in hits.items()
+            if category != best_category and hits[best_category] < KEYWORD_MARGIN * count
+        ]
+        return best_category, [best_category] + rivals if rivals else []
+
+    def _fallback_classification(self, text_lower: str) -> tuple[str, float]:
+        """Simple fallback based on basic business terms in lowercased text."""
+        found_terms = {term for term in self.business_terms if term in text_lower}
+        business_count = len(found_terms)
         
         if business_count >= 2:
             return "Manual Review", CONFIDENCE_THRESHOLDS['low']
-        elif 'payment' in text_lower:
+        elif 'payment' in found_terms:
             return "Payments Claim", CONFIDENCE_THRESHOLDS['low']
-        elif 'invoice' in text_lower:
+        elif 'invoice' in found_terms:
             return "Invoices Request", CONFIDENCE_THRESHOLDS['low']
         else:
             return "Manual Review", 0.4
 
+    def _create_category_result(self, category: str, confidence: float) -> Dict[str, Any]:
+        """Result for a main category with its default subcategory."""
+        return self._create_result(
+            category=category,
+            subcategory=self._get_default_subcategory(category),
+            confidence=confidence,
+            reason=f"ML: {category}"
+        )
+
     def _get_default_subcategory(self, main_category: str) -> str:
         """Get default subcategory for main category."""
         return self.subcategory_defaults.get(main_category, "Complex Queries")
@@ -182,16 +655,14 @@ class MLClassifier:
         if not isinstance(text, str):
             return ""
         
-        # Basic cleaning
-        text = re.sub(r'\s+', ' ', text.strip())
-        text = re.sub(r'[^\w\s@.-]', ' ', text)
-        
-        # Limit length
-        words = text.split()
-        if len(words) > MAX_TEXT_LENGTH:
-            text = ' '.join(words[:MAX_TEXT_LENGTH])
+        # Basic cleaning - table for ASCII, regex only for remaining non-ASCII characters
+        text = text.translate(NON_WORD_TABLE)
+        if not text.isascii():
+            text = NON_WORD_PATTERN.sub(' ', text)
         
-        return text.lower()
+        # One split both collapses whitespace and limits length
+        words = text.split(None, MAX_TEXT_LENGTH)
+        return ' '.join(words[:MAX_TEXT_LENGTH]).lower()
 
     def _create_result(self, category: str, subcategory: str, confidence: float, reason: str) -> Dict[str, Any]:
         """Create simple classification result."""
@@ -205,9 +676,17 @@ class MLClassifier:
 
     def get_model_info(self) -> Dict[str, Any]:
         """Get basic model information."""
+        total = self._model_skipped + self._model_scored
         return {
-            'model_available': self.classifier is not None,
+            'model_available': self.model is not None,
+            'model_loaded': self._model_loaded,
+            'model_name': self.model_name,
+            'loaded_model_name': self.loaded_model_name,
+            'model_dtype': str(self.model_dtype) if self.model_dtype else None,
             'main_categories': len(self.main_categories),
             'confidence_thresholds': CONFIDENCE_THRESHOLDS,
-            'max_text_length': MAX_TEXT_LENGTH
+            'max_text_length': MAX_TEXT_LENGTH,
+            'max_premise_tokens': MAX_PREMISE_TOKENS,
+            'result_cache': self.cache_info(),
+            'model_skip_rate': round(self._model_skipped / total, 3) if total else 0.0
         }
\ No newline at end of file
@@ -347,8 +347,7 @@ class NLPProcessor:
     def _clean_text(self, text: str) -> str:
         """Simple text cleaning."""
         text = unicodedata.normalize('NFKC', text)
-        text = re.sub(r'\s+', ' ', text.strip())
-        return text
+        return ' '.join(text.split())
 
     def _identify_topics(self, text: str) -> List[str]:
         """Identify topics using hierarchy patterns."""
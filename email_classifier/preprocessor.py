@@ -112,6 +112,27 @@ class EmailPreprocessor:
             for p in self.THREAD_SEPARATORS
         ]
         
+        self.compiled_thread_indicators = [
+            (p, re.compile(p, re.IGNORECASE | re.DOTALL))
+            for p in self.THREAD_SEPARATORS + self.THREAD_INDICATORS
+        ]
+        
+        # Per-call cleanup patterns
+        self.zero_width_pattern = re.compile(r'[\u200b-\u200f]')
+        self.markdown_link_pattern = re.compile(r'\[([^\]]*)\]\([^\)]*\)')
+        self.markdown_format_pattern = re.compile(r'[*_~`]{2,}')
+        self.subject_prefix_patterns = [
+            re.compile(p, re.IGNORECASE)
+            for p in [r'^Re:\s*', r'^Fwd:\s*', r'^FW:\s*', r'^\[EXTERNAL\]\s*', r'^ODP:\s*']
+        ]
+        self.minimal_noise_patterns = [
+            re.compile(r'EXTERNAL:\s*This e-mail originates from outside the organization\.'),
+            re.compile(r'Learn why this is important'),
+            re.compile(r'This is the first time.*?sender.*?\([^)]+\)', re.IGNORECASE),
+            re.compile(r'Exercise caution when clicking.*?authenticity', re.IGNORECASE),
+            re.compile(r'Some people.*?don\'t often get email from.*?@[^\s.]+', re.IGNORECASE),
+        ]
+        
         # Compile custom patterns
         self.farewell_pattern = re.compile(
             r"^\s*(?:" + "|".join(re.escape(p) for p in self.FAREWELL_PHRASES) + r")[\s\.,!]*$", 
@@ -199,19 +220,16 @@ class EmailPreprocessor:
     def _normalize_text(self, text: str) -> str:
         """Normalize text by handling special characters and whitespace."""
         text = text.replace('\xa0', ' ')
-        text = re.sub(r'[\u200b-\u200f]', '', text)
+        text = self.zero_width_pattern.sub('', text)
         text = unicodedata.normalize('NFKC', text)
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\n\s*\n', '\n', text)
-        return text.strip()
+        # Collapses all whitespace, newlines included, and strips
+        return ' '.join(text.split())
 
     def _detect_thread(self, text: str) -> Tuple[bool, int]:
         """Conservative thread detection."""
-        all_indicators = self.THREAD_SEPARATORS + self.THREAD_INDICATORS
-        
         count = 0
-        for indicator in all_indicators:
-            if re.search(indicator, text, re.IGNORECASE | re.DOTALL):
+        for indicator, pattern in self.compiled_thread_indicators:
+            if pattern.search(text):
                 count += 1
                 logger.info(f"Found thread indicator: {indicator[:50]}...")
         
@@ -247,9 +265,8 @@ class EmailPreprocessor:
         subject = ' '.join(subject.split())
         
         # Remove common prefixes
-        prefixes = [r'^Re:\s*', r'^Fwd:\s*', r'^FW:\s*', r'^\[EXTERNAL\]\s*', r'^ODP:\s*']
-        for prefix in prefixes:
-            subject = re.sub(prefix, '', subject, flags=re.IGNORECASE)
+        for prefix_pattern in self.subject_prefix_patterns:
+            subject = prefix_pattern.sub('', subject)
         
         return subject.strip()
 
@@ -276,10 +293,9 @@ class EmailPreprocessor:
                 logger.info(f"Removed noise pattern")
         
         # STEP 5: Clean up whitespace and markdown
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\n\s*\n', '\n', text)
-        text = re.sub(r'\[([^\]]*)\]\([^\)]*\)', r'\1', text)  # Links
-        text = re.sub(r'[*_~`]{2,}', '', text)  # Formatting
+        text = ' '.join(text.split())
+        text = self.markdown_link_pattern.sub(r'\1', text)  # Links
+        text = self.markdown_format_pattern.sub('', text)  # Formatting
         text = text.strip()
         
         logger.info(f"Final enhanced body length: {len(text)}")
@@ -341,11 +357,8 @@ class EmailPreprocessor:
         text = self._normalize_text(text)
         
         # Remove only the most obvious noise including safety warnings
-        text = re.sub(r'EXTERNAL:\s*This e-mail originates from outside the organization\.', '', text)
-        text = re.sub(r'Learn why this is important', '', text)
-        text = re.sub(r'This is the first time.*?sender.*?\([^)]+\)', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'Exercise caution when clicking.*?authenticity', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'Some people.*?don\'t often get email from.*?@[^\s.]+', '', text, flags=re.IGNORECASE)
+        for pattern in self.minimal_noise_patterns:
+            text = pattern.sub('', text)
         
         return text.strip()
 
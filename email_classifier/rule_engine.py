@@ -27,14 +27,16 @@ class RuleEngine:
     Priority Flow: Attachments → Thread Routing → Regular Classification
     """
     
-    def __init__(self):
+    def __init__(self, nlp_processor: Optional[NLPProcessor] = None):
         self.logger = logging.getLogger(__name__)
         self.pattern_matcher = PatternMatcher()
-        self.nlp_processor = NLPProcessor()
+        # Share the caller's processor so its pattern tables are built only once
+        self.nlp_processor = nlp_processor or NLPProcessor()
         
         # Initialize enhanced rules
         self._initialize_hierarchy_rules()
         self._initialize_thread_patterns()
+        self._initialize_thread_phrases()
         self._initialize_noreply_patterns()
         
         self.logger.info("✅ Enhanced RuleEngine with Thread Logic initialized")
@@ -105,6 +107,59 @@ class RuleEngine:
             }
         }
 
+    def _initialize_thread_phrases(self) -> None:
+        """Initialize thread payment and invoice phrase lists once instead of per call."""
+        
+        # Enhanced patterns for specific cases; dispute/responsibility phrases redirect to Manual Review
+        self.dispute_responsibility_phrases = [
+            'do not owe', 'not responsible', 'not our responsibility', 'we don\'t owe', 
+            'are not responsible', 'not liable', 'dispute this', 'disputing this',
+            'formally disputing', 'dispute this debt', 'contested payment', 'refuse payment',
+            'unaware of this charge', 'researching this charge', 'no record of any charge',
+            'no record of', 'never received', 'havent done business with', 'haven\'t done business',
+            'dont have record', 'don\'t have record', 'unaware of', 'no knowledge of',
+            'error on your end', 'this is an error', 'write off this amount', 'write off amount',
+            'billing error', 'incorrect charge', 'mistake on', 'charge is bogus', 'bogus charge',
+            'looks like a scam', 'consider this a scam', 'this seems like a scam'
+        ]
+        
+        self.past_payment_claims = [
+            'already paid', 'payment was made', 'check was sent', 'we paid', 'account paid',
+            'this was paid', 'been paid', 'payment completed', 'paid this outstanding balance',
+            'has been paid', 'we have paid', 'paid this', 'paid the', 'payment made', 'balance paid',
+            'account was paid', 'invoice was paid', 'bill was paid', 'check mailed',
+            'payment sent', 'paid in full', 'settled this account', 'cleared this balance'
+        ]
+        
+        self.future_payment_phrases = [
+            'will pay', 'will make payment', 'going to pay', 'plan to pay', 'intend to pay',
+            'we will pay', 'i will pay', 'planning to pay', 'will send payment',
+            'payment will be sent', 'payment being processed', 'working on payment',
+            'payment scheduled', 'schedule payment', 'arrange payment', 'payment arrangement',
+            'payment this upcoming', 'payment next week', 'payment from next week',
+            'make payment next', 'can we do the first payment', 'first payment this',
+            'issue a payment plan', 'payment plan', 'installment plan', 'when can we pay',
+            'payment awaiting', 'payment is awaiting', 'waiting for payment information',
+            'will issue payment', 'processing payment', 'payment in process'
+        ]
+        
+        self.payment_proof_indicators = [
+            'receipt', 'confirmation', 'check number', 'transaction id', 'proof of payment',
+            'payment confirmation', 'eft#', 'wire confirmation', 'batch number', 'reference number',
+            'payment receipt', 'proof attached', 'confirmation attached', 'receipt attached',
+            'bank confirmation', 'transfer confirmation', 'payment verification'
+        ]
+        
+        # ENHANCED: Add common invoice request phrases that are missed
+        self.common_invoice_requests = [
+            'send a copy of the invoice', 'send copy of the invoice', 'send the invoice',
+            'provide an invoice copy', 'provide invoice copy', 'copy of the invoice',
+            'send me the invoice', 'need invoice copy', 'provide outstanding invoices',
+            'copies of invoices', 'share invoice', 'forward invoice',
+            'invoice request', 'need invoice documentation', 'send invoices',
+            'invoice copy in pdf', 'copy of invoice', 'invoice that is due'
+        ]
+
     def _initialize_noreply_patterns(self) -> None:
         """Initialize no-reply sender patterns and thread edge cases by REUSING existing patterns."""
         
@@ -114,6 +169,8 @@ class RuleEngine:
             r'notifications@', r'system@', r'alerts@', r'automated@',
             r'support-noreply@', r'billing-noreply@'
         ]
+        # One alternation checks the sender against every pattern in a single search
+        self.noreply_sender_pattern = re.compile('|'.join(self.noreply_patterns))
         
         # REUSE EDGE CASE PATTERNS FROM NLP PROCESSOR
         self.thread_edge_patterns = {
@@ -203,7 +260,7 @@ class RuleEngine:
                     return RuleResult("Manual Review", "Complex Queries", 0.95, 
                                     "Email with attachment", ["attachment_general"])
 
-            if sender_lower and any(re.search(pattern, sender_lower) for pattern in self.noreply_patterns):
+            if sender_lower and self.noreply_sender_pattern.search(sender_lower):
                 if any(error in text_lower for error in ['error', 'failed', 'processing', 'delivery']):
                     return RuleResult("No Reply (with/without info)", "Processing Errors", 0.90,
                                     "No-reply sender + Error content", ["noreply_error"])
@@ -297,15 +354,13 @@ class RuleEngine:
             
             # Check invoice receipt patterns from NLP
             if 'Invoice Receipt' in nlp_indicators:
-                invoice_matches = sum(1 for pattern in nlp_indicators['Invoice Receipt'] if pattern in text)
-                if invoice_matches >= 1:
+                if any(pattern in text for pattern in nlp_indicators['Invoice Receipt']):
                     return RuleResult("Manual Review", "Invoice Receipt", 0.85,
                                     "Thread: Invoice proof provided", ["thread_invoice_proof"])
             
             # Check closure patterns from NLP
             if 'Closure Notification' in nlp_indicators:
-                closure_matches = sum(1 for pattern in nlp_indicators['Closure Notification'] if pattern in text)
-                if closure_matches >= 1:
+                if any(pattern in text for pattern in nlp_indicators['Closure Notification']):
                     if any(payment in text for payment in ['outstanding payment', 'payment due', 'owed']):
                         return RuleResult("Manual Review", "Closure + Payment Due", 0.87,
                                         "Thread: Closure with payment due", ["thread_closure_payment"])
@@ -315,15 +370,13 @@ class RuleEngine:
             
             # Check complex queries patterns from NLP
             if 'Complex Queries' in nlp_indicators:
-                complex_matches = sum(1 for pattern in nlp_indicators['Complex Queries'] if pattern in text)
-                if complex_matches >= 1:
+                if any(pattern in text for pattern in nlp_indicators['Complex Queries']):
                     return RuleResult("Manual Review", "Complex Queries", 0.82,
                                     "Thread: Complex business content", ["thread_complex"])
             
             # Check inquiry/redirection patterns from NLP
             if 'Inquiry/Redirection' in nlp_indicators:
-                inquiry_matches = sum(1 for pattern in nlp_indicators['Inquiry/Redirection'] if pattern in text)
-                if inquiry_matches >= 1:
+                if any(pattern in text for pattern in nlp_indicators['Inquiry/Redirection']):
                     return RuleResult("Manual Review", "Inquiry/Redirection", 0.80,
                                     "Thread: Inquiry/redirection", ["thread_inquiry"])
         
@@ -391,63 +444,23 @@ class RuleEngine:
                 return RuleResult("Payments Claim", subcat, confidence + 0.10,
                                 f"Thread + Pattern: {subcat}", ["thread_pattern_match"] + matched_patterns)
         
-        # Enhanced patterns for specific cases
-        dispute_responsibility_phrases = [
-            'do not owe', 'not responsible', 'not our responsibility', 'we don\'t owe', 
-            'are not responsible', 'not liable', 'dispute this', 'disputing this',
-            'formally disputing', 'dispute this debt', 'contested payment', 'refuse payment',
-            'unaware of this charge', 'researching this charge', 'no record of any charge',
-            'no record of', 'never received', 'havent done business with', 'haven\'t done business',
-            'dont have record', 'don\'t have record', 'unaware of', 'no knowledge of',
-            'error on your end', 'this is an error', 'write off this amount', 'write off amount',
-            'billing error', 'incorrect charge', 'mistake on', 'charge is bogus', 'bogus charge',
-            'looks like a scam', 'consider this a scam', 'this seems like a scam'
-        ]
-        
-        past_payment_claims = [
-            'already paid', 'payment was made', 'check was sent', 'we paid', 'account paid',
-            'this was paid', 'been paid', 'payment completed', 'paid this outstanding balance',
-            'has been paid', 'we have paid', 'paid this', 'paid the', 'payment made', 'balance paid',
-            'account was paid', 'invoice was paid', 'bill was paid', 'check mailed',
-            'payment sent', 'paid in full', 'settled this account', 'cleared this balance'
-        ]
-        
-        future_payment_phrases = [
-            'will pay', 'will make payment', 'going to pay', 'plan to pay', 'intend to pay',
-            'we will pay', 'i will pay', 'planning to pay', 'will send payment',
-            'payment will be sent', 'payment being processed', 'working on payment',
-            'payment scheduled', 'schedule payment', 'arrange payment', 'payment arrangement',
-            'payment this upcoming', 'payment next week', 'payment from next week',
-            'make payment next', 'can we do the first payment', 'first payment this',
-            'issue a payment plan', 'payment plan', 'installment plan', 'when can we pay',
-            'payment awaiting', 'payment is awaiting', 'waiting for payment information',
-            'will issue payment', 'processing payment', 'payment in process'
-        ]
-        
-        payment_proof_indicators = [
-            'receipt', 'confirmation', 'check number', 'transaction id', 'proof of payment',
-            'payment confirmation', 'eft#', 'wire confirmation', 'batch number', 'reference number',
-            'payment receipt', 'proof attached', 'confirmation attached', 'receipt attached',
-            'bank confirmation', 'transfer confirmation', 'payment verification'
-        ]
-        
         # Check for dispute/responsibility patterns FIRST
-        dispute_matches = sum(1 for pattern in dispute_responsibility_phrases if pattern in text)
+        dispute_matches = sum(1 for pattern in self.dispute_responsibility_phrases if pattern in text)
         if dispute_matches >= 1:
             return RuleResult("Manual Review", "Partial/Disputed Payment", 0.90,
                             "Thread: Dispute/responsibility detected", ["thread_dispute_responsibility"])
         
         # Check for future payment patterns
-        future_matches = sum(1 for pattern in future_payment_phrases if pattern in text)
+        future_matches = sum(1 for pattern in self.future_payment_phrases if pattern in text)
         if future_matches >= 1:
             confidence = min(0.88 + (future_matches * 0.02), 0.95)
             return RuleResult("Payments Claim", "Payment Details Received", confidence,
                             "Thread: Future payment planned", ["thread_payment_future"])
         
         # Check for past payment claims with proof
-        past_matches = sum(1 for pattern in past_payment_claims if pattern in text)
+        past_matches = sum(1 for pattern in self.past_payment_claims if pattern in text)
         if past_matches >= 1:
-            proof_indicators = sum(1 for pattern in payment_proof_indicators if pattern in text)
+            proof_indicators = sum(1 for pattern in self.payment_proof_indicators if pattern in text)
             
             if proof_indicators >= 1:
                 confidence = min(0.90 + (proof_indicators * 0.02), 0.95)
@@ -463,18 +476,8 @@ class RuleEngine:
     def _classify_thread_invoices(self, text: str) -> Optional[RuleResult]:
         """Classify thread emails for Invoices Request category using EXISTING patterns."""
         
-        # ENHANCED: Add common invoice request phrases that are missed
-        common_invoice_requests = [
-            'send a copy of the invoice', 'send copy of the invoice', 'send the invoice',
-            'provide an invoice copy', 'provide invoice copy', 'copy of the invoice',
-            'send me the invoice', 'need invoice copy', 'provide outstanding invoices',
-            'copies of invoices', 'share invoice', 'forward invoice',
-            'invoice request', 'need invoice documentation', 'send invoices',
-            'invoice copy in pdf', 'copy of invoice', 'invoice that is due'
-        ]
-        
         # Check for common invoice request patterns FIRST
-        invoice_request_matches = sum(1 for pattern in common_invoice_requests if pattern in text)
+        invoice_request_matches = sum(1 for pattern in self.common_invoice_requests if pattern in text)
         if invoice_request_matches >= 1:
             # Make sure it's not providing proof (which would be Manual Review)
             if not any(proof in text for proof in ['attached', 'proof', 'documentation', 'receipt', 'was paid', 'see attached']):
@@ -565,15 +568,11 @@ class RuleEngine:
 
 
     # ADD THIS NEW METHOD TO rule_engine.py
-    def _detect_email_type(self, text: str, subject: str, sender: str = "") -> str:
+    def _detect_email_type(self, text_lower: str, subject_lower: str, sender_lower: str = "") -> str:
         """
-        Detect if email is human-written vs automated/system generated.
+        Detect if email is human-written vs automated/system generated (inputs already lowercased).
         Returns: 'human', 'automated', 'mixed'
         """
-        text_lower = text.lower()
-        subject_lower = subject.lower()
-        sender_lower = sender.lower()
-        
         # AUTOMATED/SYSTEM EMAIL INDICATORS
         automated_indicators = [
             # System notifications
@@ -642,14 +641,14 @@ class RuleEngine:
             return 'mixed'
 
     def _apply_regular_classification(self, text: str, subject: str, sender: str = "") -> Optional[RuleResult]: 
-        """Apply regular classification with FIXED PRIORITY ORDER."""
+        """Apply regular classification with FIXED PRIORITY ORDER (text, subject and sender already lowercased)."""
 
         email_type = self._detect_email_type(text, subject, sender)
 
         # STEP 1: SYSTEM/AUTOMATED EMAIL PATTERNS (HIGH PRIORITY)
         if email_type == 'automated':
             # System ticket notifications
-            if any(phrase in text.lower() for phrase in [
+            if any(phrase in text for phrase in [
                 'ticket has been created', 'case has been opened', 'your request has been received',
                 'ticket id', 'case number', 'support request created', 'member of our team will'
             ]):
@@ -657,7 +656,7 @@ class RuleEngine:
                                 "Automated ticket notification", ["automated_ticket_rule"])
             
             # System acknowledgments with info
-            if any(phrase in text.lower() for phrase in [
+            if any(phrase in text for phrase in [
                 'knowledge base', 'self-help articles', 'within.*business days',
                 'will investigate and get back', 'team will contact you'
             ]):
@@ -667,7 +666,7 @@ class RuleEngine:
         # STEP 2: HUMAN INQUIRY PATTERNS (HIGH PRIORITY)
         elif email_type == 'human':
             # Technical issues/problems
-            if any(phrase in text.lower() for phrase in [
+            if any(phrase in text for phrase in [
                 'issues logging in', 'having trouble', 'cannot log in', 'problem with',
                 'not working', 'error when', 'unable to access', 'login issues'
             ]):
@@ -675,7 +674,7 @@ class RuleEngine:
                                 "Human technical inquiry", ["human_tech_issue_rule"])
             
             # Contact/redirection requests
-            if any(phrase in text.lower() for phrase in [
+            if any(phrase in text for phrase in [
                 'i did not work for', 'not sure who your contact should be', 'unfortunately it is not me',
                 'i am not the right person', 'please contact someone else', 'wrong person'
             ]):
@@ -683,7 +682,7 @@ class RuleEngine:
                                 "Human contact redirection", ["human_redirect_rule"])
             
             # Human requests for action/response
-            if any(phrase in text.lower() for phrase in [
+            if any(phrase in text for phrase in [
                 'why don\'t you call me', 'please call me', 'need you to contact me',
                 'please let me know when', 'at a loss as to why', 'don\'t understand why'
             ]):
@@ -701,9 +700,9 @@ class RuleEngine:
             # CRITICAL: Add the missing pattern from your example
             'please share the invoice copy', 'share the invoice copy', 'provide invoice copy'
         ]
-        if any(phrase in text.lower() for phrase in invoice_request_phrases):
+        if any(phrase in text for phrase in invoice_request_phrases):
             # Make sure it's not providing proof (which would be Manual Review)
-            if not any(proof in text.lower() for proof in ['paid', 'proof', 'attached', 'was paid', 'receipt']):
+            if not any(proof in text for proof in ['paid', 'proof', 'attached', 'was paid', 'receipt']):
                 return RuleResult("Invoices Request", "Request (No Info)", 0.90,
                                 "Invoice request detected", ["invoice_request_rule"])
 
@@ -718,7 +717,7 @@ class RuleEngine:
             'this is an error', 'write off this amount', 'charge is bogus', 'bogus charge',
             'dont have record', 'don\'t have record', 'never received invoice', 'no knowledge of'
         ]
-        if any(phrase in text.lower() for phrase in dispute_phrases):
+        if any(phrase in text for phrase in dispute_phrases):
             return RuleResult("Manual Review", "Partial/Disputed Payment", 0.95, 
                             "Dispute detected", ["dispute_rule"])
 
@@ -731,7 +730,7 @@ class RuleEngine:
             'payment receipt', 'confirmation attached', 'eft#', 'wire confirmation',
             'batch number', 'reference number', 'bank confirmation'
         ]
-        if any(phrase in text.lower() for phrase in payment_proof_phrases):
+        if any(phrase in text for phrase in payment_proof_phrases):
             return RuleResult("Payments Claim", "Payment Confirmation", 0.90, 
                             "Payment proof provided", ["payment_proof_rule"])
         
@@ -745,7 +744,7 @@ class RuleEngine:
             'schedule payment', 'arrange payment', 'payment arrangement', 'payment awaiting',
             'payment is awaiting', 'when can we pay', 'payment plan', 'installment plan'
         ]
-        if any(phrase in text.lower() for phrase in payment_details_phrases):
+        if any(phrase in text for phrase in payment_details_phrases):
             return RuleResult("Payments Claim", "Payment Details Received", 0.85, 
                             "Payment details received", ["payment_details_rule"])
         
@@ -756,7 +755,7 @@ class RuleEngine:
             'verify this has been paid', 'please verify', 'we paid', 'been paid',
             'payment completed', 'account was paid', 'invoice was paid', 'bill was paid'
         ]
-        if any(phrase in text.lower() for phrase in payment_claim_phrases):
+        if any(phrase in text for phrase in payment_claim_phrases):
             return RuleResult("Payments Claim", "Claims Paid (No Info)", 0.85, 
                             "Payment claimed without proof", ["payment_claim_rule"])
 
@@ -766,8 +765,8 @@ class RuleEngine:
             'company closed', 'permanently closed', 'filing for bankruptcy', 'bankruptcy protection',
             'chapter 7', 'chapter 11', 'business shutting down', 'liquidated', 'dissolved'
         ]
-        if any(phrase in text.lower() for phrase in closure_phrases):
-            if any(payment in text.lower() for payment in ['outstanding payment', 'payment due', 'amount owed', 'balance due']):
+        if any(phrase in text for phrase in closure_phrases):
+            if any(payment in text for payment in ['outstanding payment', 'payment due', 'amount owed', 'balance due']):
                 return RuleResult("Manual Review", "Closure + Payment Due", 0.90, 
                                 "Closure with payment due", ["closure_payment_rule"])
             else:
@@ -778,7 +777,7 @@ class RuleEngine:
         
         # Enhanced OOO detection - check subject first
         subject_ooo_indicators = ['automatic reply', 'auto reply', 'out of office', 'ooo']
-        has_ooo_subject = any(indicator in subject.lower() for indicator in subject_ooo_indicators)
+        has_ooo_subject = any(indicator in subject for indicator in subject_ooo_indicators)
         
         # Enhanced OOO phrases
         ooo_phrases = [
@@ -789,11 +788,11 @@ class RuleEngine:
             'will be out', 'i will be out', 'currently attending', 'away from email'
         ]
         
-        has_ooo_content = any(phrase in text.lower() for phrase in ooo_phrases)
+        has_ooo_content = any(phrase in text for phrase in ooo_phrases)
         
         # CRITICAL: Only classify as OOO if NO BUSINESS CONTENT is present
         business_terms = ['payment', 'invoice', 'dispute', 'collection', 'debt', 'billing']
-        business_count = sum(1 for term in business_terms if term in text.lower())
+        business_count = sum(1 for term in business_terms if term in text)
         
         if (has_ooo_subject or has_ooo_content) and business_count == 0:
             # Check for return date patterns
@@ -813,9 +812,9 @@ class RuleEngine:
             ]
             
             # Enhanced return date detection
-            has_return_date = any(phrase in text.lower() for phrase in return_date_phrases)
+            has_return_date = any(phrase in text for phrase in return_date_phrases)
             # Enhanced contact detection  
-            has_contact_info = any(phrase in text.lower() for phrase in contact_phrases)
+            has_contact_info = any(phrase in text for phrase in contact_phrases)
             
             # Also check for phone numbers or email addresses as contact indicators
             import re
@@ -842,7 +841,7 @@ class RuleEngine:
             'case number assigned', 'ticket submitted successfully', 'new case created',
             'case has been created', 'ticket logged', 'case logged'
         ]
-        if any(phrase in text.lower() for phrase in ticket_creation_phrases):
+        if any(phrase in text for phrase in ticket_creation_phrases):
             return RuleResult("No Reply (with/without info)", "Created", 0.85, 
                             "Ticket created", ["ticket_created_rule"])
         
@@ -851,7 +850,7 @@ class RuleEngine:
             'issue resolved', 'request completed', 'ticket has been resolved',
             'case completed', 'ticket closed', 'resolved successfully'
         ]
-        if any(phrase in text.lower() for phrase in ticket_resolved_phrases):
+        if any(phrase in text for phrase in ticket_resolved_phrases):
             return RuleResult("No Reply (with/without info)", "Resolved", 0.85, 
                             "Ticket resolved", ["ticket_resolved_rule"])
         
@@ -859,7 +858,7 @@ class RuleEngine:
             'ticket open', 'case pending', 'under investigation', 'being processed', 'in progress',
             'case open', 'still pending', 'awaiting response', 'under review'
         ]
-        if any(phrase in text.lower() for phrase in ticket_open_phrases):
+        if any(phrase in text for phrase in ticket_open_phrases):
             return RuleResult("No Reply (with/without info)", "Open", 0.80, 
                             "Open ticket", ["ticket_open_rule"])
 
@@ -870,7 +869,7 @@ class RuleEngine:
             'system unable to process', 'cannot be processed', 'email bounced', 'delivery failure',
             'processing failed', 'system error', 'unable to import', 'import failed'
         ]
-        if any(phrase in text.lower() for phrase in processing_phrases):
+        if any(phrase in text for phrase in processing_phrases):
             return RuleResult("No Reply (with/without info)", "Processing Errors", 0.85, 
                             "Processing error", ["processing_rule"])
 
@@ -878,9 +877,9 @@ class RuleEngine:
         
         survey_phrases = ['survey', 'feedback request', 'rate our service', 'customer satisfaction',
                         'take our survey', 'service evaluation', 'your feedback']
-        if any(phrase in text.lower() for phrase in survey_phrases):
+        if any(phrase in text for phrase in survey_phrases):
             business_terms = ['payment', 'invoice', 'dispute', 'collection']
-            if not any(business in text.lower() for business in business_terms):
+            if not any(business in text for business in business_terms):
                 return RuleResult("Auto Reply (with/without info)", "Survey", 0.85, 
                                 "Survey detected", ["survey_rule"])
 
@@ -889,7 +888,7 @@ class RuleEngine:
             'please quit contacting', 'do not contact me further', 'contact information updated',
             'no longer with', 'no longer affiliated', 'please remove me', 'unsubscribe'
         ]
-        if any(phrase in text.lower() for phrase in contact_change_phrases):
+        if any(phrase in text for phrase in contact_change_phrases):
             return RuleResult("Auto Reply (with/without info)", "Redirects/Updates (property changes)", 0.85,
                             "Contact change", ["contact_change_rule"])
         
@@ -900,7 +899,7 @@ class RuleEngine:
             'prices increasing', 'sale ending', 'payment plan options', 'exclusive deal',
             'pricing', 'promotion', 'marketing', 'sales representative'
         ]
-        if any(phrase in text.lower() for phrase in sales_phrases):
+        if any(phrase in text for phrase in sales_phrases):
             return RuleResult("No Reply (with/without info)", "Sales/Offers", 0.80, 
                             "Sales/marketing", ["sales_rule"])
 
@@ -910,7 +909,9 @@ class RuleEngine:
         """Apply conservative fallback logic."""
         
         business_terms = ['payment', 'invoice', 'dispute', 'collection', 'debt', 'billing']
-        business_count = sum(1 for term in business_terms if term in text)
+        # One scan per term; the hit set answers the payment/invoice checks below
+        found_terms = {term for term in business_terms if term in text}
+        business_count = len(found_terms)
         
         if business_count >= 2:
             confidence = 0.65 if had_threads else 0.60
@@ -918,10 +919,10 @@ class RuleEngine:
                             "Multiple business terms", ["business_fallback"])
         elif business_count == 1:
             confidence = 0.60 if had_threads else 0.55
-            if 'payment' in text:
+            if 'payment' in found_terms:
                 return RuleResult("Payments Claim", "Claims Paid (No Info)", confidence, 
                                 "Payment term", ["payment_fallback"])
-            elif 'invoice' in text:
+            elif 'invoice' in found_terms:
                 return RuleResult("Invoices Request", "Request (No Info)", confidence, 
                                 "Invoice term", ["invoice_fallback"])
             else: